@@ -0,0 +1,13 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """Start and end every test with an empty query result cache."""
+    app_module._query_cache.clear()
+    yield
+    app_module._query_cache.clear()
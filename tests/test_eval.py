@@ -0,0 +1,110 @@
+"""Tests for the /eval/tc evaluation endpoint."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+import app as app_module
+
+
+@pytest.fixture
+def eval_data(monkeypatch):
+    """Point the evaluator at an in-memory test set with empty ground truth."""
+
+    def use(queries):
+        ground_truths = [[] for _ in queries]
+        ground_truth_sets = [frozenset() for _ in queries]
+        monkeypatch.setattr(app_module, "load_test_queries", lambda: queries)
+        monkeypatch.setattr(
+            app_module,
+            "load_ground_truth_with_sets",
+            lambda: (ground_truths, ground_truth_sets),
+        )
+
+    return use
+
+
+def test_evaluates_bundled_test_cases(monkeypatch):
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+
+    response = asyncio.run(app_module.evaluate_test_cases(concurrency=4))
+
+    assert response.total_queries == len(app_module.load_test_queries())
+    assert [r.query for r in response.results] == app_module.load_test_queries()
+
+
+def test_at_most_concurrency_queries_run_at_once(monkeypatch, eval_data):
+    eval_data([f"query {i}" for i in range(6)])
+    in_flight = 0
+    peak = 0
+
+    async def pipeline(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return app_module.QueryResponse(results=[])
+
+    monkeypatch.setattr(app_module, "_run_pipeline", pipeline)
+
+    response = asyncio.run(app_module.evaluate_test_cases(concurrency=2))
+
+    assert response.total_queries == 6
+    assert peak == 2
+
+
+def test_duplicate_queries_run_once_and_share_predictions(monkeypatch, eval_data):
+    queries = ["b", "a", "b", "c", "a", "b"]
+    eval_data(queries)
+    calls = []
+
+    async def pipeline(request):
+        calls.append(request.query)
+        # Yield so duplicates would all miss the result cache if not deduplicated
+        await asyncio.sleep(0)
+        return app_module.QueryResponse(
+            results=[
+                app_module.ProductResult(product_id=f"ID_{request.query}", reason="")
+            ]
+        )
+
+    monkeypatch.setattr(app_module, "_run_pipeline", pipeline)
+
+    response = asyncio.run(app_module.evaluate_test_cases(concurrency=4))
+
+    assert sorted(calls) == ["a", "b", "c"]
+    assert [r.query for r in response.results] == queries
+    assert [r.predicted_products for r in response.results] == [
+        [f"ID_{query}"] for query in queries
+    ]
+
+
+def test_failed_query_cancels_the_rest(monkeypatch, eval_data):
+    eval_data(["fail", "slow a", "slow b"])
+    cancelled = []
+
+    async def pipeline(request):
+        if request.query == "fail":
+            raise RuntimeError("LLM unavailable")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(request.query)
+            raise
+
+    monkeypatch.setattr(app_module, "_run_pipeline", pipeline)
+
+    async def evaluate():
+        with pytest.raises(HTTPException) as exc_info:
+            await app_module.evaluate_test_cases(concurrency=3)
+        # Snapshot before asyncio.run() tears down any leftover tasks
+        return exc_info.value, list(cancelled)
+
+    error, cancelled_on_failure = asyncio.run(evaluate())
+
+    assert error.status_code == 500
+    assert "Query failed for: fail: LLM unavailable" in error.detail
+    assert sorted(cancelled_on_failure) == ["slow a", "slow b"]
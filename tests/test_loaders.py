@@ -0,0 +1,57 @@
+"""Tests for the evaluation data loaders."""
+
+import os
+
+from app import load_ground_truth, load_ground_truth_with_sets, load_test_queries
+
+
+def test_load_test_queries_skips_blank_lines(tmp_path):
+    path = tmp_path / "tc.txt"
+    path.write_text("  첫 번째 질문 \n\nsecond\n", encoding="utf-8")
+
+    assert load_test_queries(str(path)) == ["첫 번째 질문", "second"]
+
+
+def test_ground_truth_lists_and_sets_come_from_one_read(tmp_path):
+    path = tmp_path / "answer.txt"
+    path.write_text("G1, G2,G1\n\nG3\n", encoding="utf-8")
+
+    ground_truths, ground_truth_sets = load_ground_truth_with_sets(str(path))
+
+    assert ground_truths == [["G1", "G2", "G1"], [], ["G3"]]
+    assert ground_truth_sets == [
+        frozenset({"G1", "G2"}),
+        frozenset(),
+        frozenset({"G3"}),
+    ]
+    assert load_ground_truth(str(path)) == ground_truths
+
+
+def test_loaders_reload_after_the_file_changes(tmp_path):
+    path = tmp_path / "answer.txt"
+    path.write_text("G1\n", encoding="utf-8")
+    assert load_ground_truth(str(path)) == [["G1"]]
+
+    path.write_text("G2\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert load_ground_truth_with_sets(str(path)) == ([["G2"]], [frozenset({"G2"})])
+
+
+def test_only_newlines_split_rows(tmp_path):
+    # str.splitlines() would also break on these separators
+    tc_path = tmp_path / "tc.txt"
+    tc_path.write_text("a\x1cb\nc d\n", encoding="utf-8")
+    answer_path = tmp_path / "answer.txt"
+    answer_path.write_text("G1,G2\u2028G3\nG4\n", encoding="utf-8")
+
+    assert load_test_queries(str(tc_path)) == ["a\x1cb", "c d"]
+    assert load_ground_truth(str(answer_path)) == [["G1", "G2\u2028G3"], ["G4"]]
+
+
+def test_trailing_newline_does_not_add_an_empty_row(tmp_path):
+    path = tmp_path / "answer.txt"
+    path.write_text("G1\r\n\r\nG2\r\n", encoding="utf-8")
+
+    assert load_ground_truth(str(path)) == [["G1"], [], ["G2"]]
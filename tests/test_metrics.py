@@ -0,0 +1,41 @@
+"""Tests for evaluation metric helpers."""
+
+import pytest
+
+from app import calculate_f1_score
+
+
+def test_accepts_lists():
+    assert calculate_f1_score(["a"], ["a"]) == {
+        "precision": 1.0,
+        "recall": 1.0,
+        "f1_score": 1.0,
+    }
+
+
+def test_sets_and_lists_agree():
+    predicted, ground_truth = ["a", "b", "b"], ["b", "c", "d"]
+
+    assert calculate_f1_score(predicted, ground_truth) == calculate_f1_score(
+        frozenset(predicted), frozenset(ground_truth)
+    )
+
+
+def test_partial_overlap():
+    metrics = calculate_f1_score(frozenset({"a", "b"}), frozenset({"b", "c", "d"}))
+
+    assert metrics["precision"] == pytest.approx(1 / 2)
+    assert metrics["recall"] == pytest.approx(1 / 3)
+    assert metrics["f1_score"] == pytest.approx(0.4)
+
+
+@pytest.mark.parametrize(
+    "predicted, ground_truth, expected",
+    [
+        ([], [], 1.0),
+        ([], ["a"], 0.0),
+        (["a"], [], 0.0),
+    ],
+)
+def test_empty_inputs(predicted, ground_truth, expected):
+    assert calculate_f1_score(predicted, ground_truth)["f1_score"] == expected
@@ -0,0 +1,86 @@
+"""Tests for the in-process query result cache."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import QueryRequest
+
+
+@pytest.fixture
+def pipeline_calls(monkeypatch):
+    """Count calls that reach the (uncached) pipeline."""
+    calls = []
+    run_pipeline = app_module._run_pipeline
+
+    async def counting_pipeline(request):
+        calls.append(request.query)
+        return await run_pipeline(request)
+
+    monkeypatch.setattr(app_module, "_run_pipeline", counting_pipeline)
+    return calls
+
+
+def run_query(query, max_num_result=3):
+    return asyncio.run(
+        app_module._run_query(QueryRequest(query=query, max_num_result=max_num_result))
+    )
+
+
+def test_repeated_query_is_served_from_cache(pipeline_calls):
+    first = run_query("갤럭시 S25 가격")
+    second = run_query("갤럭시 S25 가격")
+
+    assert pipeline_calls == ["갤럭시 S25 가격"]
+    assert second.results == first.results
+
+
+def test_max_num_result_is_part_of_the_key(pipeline_calls):
+    run_query("냉장고 추천", max_num_result=1)
+    response = run_query("냉장고 추천", max_num_result=3)
+
+    assert len(pipeline_calls) == 2
+    assert len(response.results) == 3
+
+
+def test_case_and_whitespace_variants_do_not_share_entries(pipeline_calls):
+    client = TestClient(app_module.app)
+
+    first = client.post("/query", json={"query": "Red Shoes", "max_num_result": 1})
+    second = client.post("/query", json={"query": "red shoes  ", "max_num_result": 1})
+
+    assert first.status_code == second.status_code == 200
+    assert pipeline_calls == ["Red Shoes", "red shoes  "]
+    assert second.json()["results"][0]["reason"] == (
+        "Mock result 1 for query: 'red shoes  '"
+    )
+
+
+def test_entries_expire_after_ttl(monkeypatch, pipeline_calls):
+    now = [1000.0]
+    monkeypatch.setattr(app_module.time, "monotonic", lambda: now[0])
+
+    run_query("사운드바 가격")
+    now[0] += app_module.QUERY_CACHE_TTL_SECONDS - 1
+    run_query("사운드바 가격")
+    assert len(pipeline_calls) == 1
+
+    now[0] += 1
+    run_query("사운드바 가격")
+    assert len(pipeline_calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch, pipeline_calls):
+    monkeypatch.setattr(app_module, "QUERY_CACHE_MAXSIZE", 2)
+
+    run_query("a")
+    run_query("b")
+    run_query("a")  # refresh "a" so "b" becomes least recently used
+    run_query("c")
+
+    assert list(app_module._query_cache) == [("a", 3), ("c", 3)]
+
+    run_query("b")
+    assert pipeline_calls == ["a", "b", "c", "b"]